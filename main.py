@@ -1,27 +1,29 @@
 import pygame
 import numpy as np
+from numba import njit, prange
 import math
 import time
 import json
 import os
 from datetime import datetime
-
-# Initialize pygame
-pygame.init()
+from functools import lru_cache
 
 # Settings
 SAMPLE_RATE = 44100
 BIT_DEPTH = 16
-BUFFER_SIZE = 1024
+BUFFER_SIZE = 512  # Mixer chunk in frames (~12 ms at 44.1 kHz, down from 1024)
+
+# Sound init (must come before pygame.init(), which opens the mixer)
+pygame.mixer.pre_init(SAMPLE_RATE, -BIT_DEPTH, 2, BUFFER_SIZE)
+
+# Initialize pygame
+pygame.init()
 
 # Create window
 screen = pygame.display.set_mode((1000, 700))
 pygame.display.set_caption("CHIPTONE")
 clock = pygame.time.Clock()
 
-# Sound init
-pygame.mixer.init(SAMPLE_RATE, -BIT_DEPTH, 2, BUFFER_SIZE)
-
 # Colors
 BACKGROUND = (10, 15, 25)
 PANEL_DARK = (20, 25, 40)
@@ -34,6 +36,77 @@ NEON_YELLOW = (255, 220, 0)
 TEXT_LIGHT = (220, 220, 240)
 TEXT_DIM = (150, 160, 180)
 
+# Wavetables (one period per waveform, read with a phase accumulator)
+WAVETABLE_SIZE = 4096
+WAVETABLE_MASK = WAVETABLE_SIZE - 1
+HARMONICS = 20
+SINE_TABLE = np.sin(2 * np.pi * np.arange(WAVETABLE_SIZE) / WAVETABLE_SIZE)
+
+def _additive_table(partials):
+    """Sum (harmonic, amplitude, quarter-turn offset) sine partials into one period"""
+    idx = np.arange(WAVETABLE_SIZE)
+    table = np.zeros(WAVETABLE_SIZE)
+    for k, amp, offset in partials:
+        table += amp * SINE_TABLE[(idx * k + offset * WAVETABLE_SIZE // 4) & WAVETABLE_MASK]
+    # Normalize so the Gibbs overshoot still fits in [-1, 1]
+    return (table / np.abs(table).max()).astype(np.float32)
+
+# Band-limited square, sawtooth and triangle from their Fourier series,
+# phased to match the naive shapes (sawtooth rises from 0, triangle starts at -1)
+WAVETABLES = {
+    'sine': SINE_TABLE.astype(np.float32),
+    'square': _additive_table([(k, 1 / k, 0) for k in range(1, HARMONICS + 1, 2)]),
+    'sawtooth': _additive_table([(k, (-1) ** (k + 1) / k, 0) for k in range(1, HARMONICS + 1)]),
+    'triangle': _additive_table([(k, -1 / k ** 2, 1) for k in range(1, HARMONICS + 1, 2)])
+}
+
+# Wavetables stacked for the compiled synth kernel, indexed by waveform id
+WAVEFORM_IDS = {name: i for i, name in enumerate(WAVETABLES)}
+_WAVETABLE_STACK = np.stack(list(WAVETABLES.values()))
+
+# Distortion curve resolution: tanh sampled over [-1, 1)
+TANH_LUT_SIZE = 2048
+
+def build_tanh_lut(amount):
+    """Tabulate tanh(x * amount) for x in [-1, 1)"""
+    x = np.arange(TANH_LUT_SIZE, dtype=np.float32) / (TANH_LUT_SIZE // 2) - 1
+    return np.tanh(x * np.float32(amount))
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _synth_fused(tables, n, freq, wf_id, dist_on, tanh_lut, bc_on, bc_mask, vol, out_i16):
+    """Generate waveform, distortion, bit crush and volume in a single pass"""
+    table = tables[wf_id]
+    phase_inc = freq * WAVETABLE_SIZE / SAMPLE_RATE
+    gain = vol * np.float32(32767)
+    bc_half = (-bc_mask) >> 1
+    for i in prange(n):
+        x = table[int(i * phase_inc) & WAVETABLE_MASK]
+        if dist_on:
+            j = int((x + 1) * (TANH_LUT_SIZE // 2))
+            x = tanh_lut[min(max(j, 0), TANH_LUT_SIZE - 1)]
+        if bc_on:
+            # Round to the nearest step in full-scale 1.15 fixed point, before volume
+            q = (math.floor(x * 32768) + bc_half) & bc_mask
+            x = np.float32(q) * np.float32(1 / 32768)
+        out_i16[i] = np.int16(x * gain)
+
+@njit(cache=True, fastmath=True)
+def _lowpass(x, alpha):
+    """One-pole low-pass filter, applied in place to int16 samples"""
+    beta = np.float32(1) - alpha
+    y = np.float32(x[0])
+    for i in range(1, x.size):
+        y = alpha * np.float32(x[i]) + beta * y
+        x[i] = np.int16(y)
+
+# Compile the kernels now rather than on the first note
+_synth_fused(_WAVETABLE_STACK, 2, 440.0, 0, True, build_tanh_lut(2.0), True, -2048, np.float32(0.5),
+             np.zeros(2, dtype=np.int16))
+_lowpass(np.zeros(2, dtype=np.int16), np.float32(0.1))
+
+# Stereo mix buffer reused across notes (make_sound copies out of it)
+_mix_scratch = np.empty((SAMPLE_RATE, 2), dtype=np.int16)
+
 class Synth:
     def __init__(self):
         self.frequency = 440
@@ -51,75 +124,114 @@ class Synth:
         }
         self.delay_time = 0.3
         self.distortion_amount = 2.0
+        self._tanh_lut = None
+        self._tanh_lut_amount = None
         self.bit_crush_factor = 4
+        self._out_i16 = np.empty(SAMPLE_RATE, dtype=np.int16)
+        self._delay_i16 = np.empty(SAMPLE_RATE, dtype=np.int16)
+        self._last_key = None
+        self._last_sound = None
         
-    def generate_sample(self, length):
-        """Generate sound sample with 8-bit emulation"""
-        t = np.linspace(0, length, int(SAMPLE_RATE * length))
-        
-        # Generate base waveform
-        if self.waveform == 'sine':
-            wave = np.sin(2 * np.pi * self.frequency * t)
-        elif self.waveform == 'square':
-            wave = np.sign(np.sin(2 * np.pi * self.frequency * t))
-        elif self.waveform == 'sawtooth':
-            wave = 2 * (t * self.frequency - np.floor(0.5 + t * self.frequency))
-        elif self.waveform == 'triangle':
-            wave = 2 * np.abs(2 * (t * self.frequency - np.floor(t * self.frequency + 0.5))) - 1
-        else:
-            wave = np.sin(2 * np.pi * self.frequency * t)
+        # Per-instance Sound cache (keyed by note and settings, not by self)
+        self._build_sound = lru_cache(maxsize=256)(self._render_sound)
         
-        # Apply effects
-        if self.effects['distortion']:
-            wave = np.tanh(wave * self.distortion_amount)
-            
-        if self.effects['bit_crush']:
-            levels = 2 ** self.bit_crush_factor
-            wave = np.round(wave * levels) / levels
-            
-        if self.effects['low_pass']:
-            alpha = 0.1
-            filtered = np.zeros_like(wave)
-            filtered[0] = wave[0]
-            for i in range(1, len(wave)):
-                filtered[i] = alpha * wave[i] + (1 - alpha) * filtered[i-1]
-            wave = filtered
+        # Dedicated mixer channel, reserved so other sounds can't claim it
+        pygame.mixer.set_reserved(1)
+        self.channel = pygame.mixer.Channel(0)
         
-        # Apply volume
-        wave = wave * self.volume
+    def generate_sample(self, freq, waveform, effects, length):
+        """Generate sound sample with 8-bit emulation"""
+        n = int(SAMPLE_RATE * length)
+        if n > len(self._out_i16):
+            self._out_i16 = np.empty(n, dtype=np.int16)
+            self._delay_i16 = np.empty(n, dtype=np.int16)
+        wave_16bit = self._out_i16[:n]
         
-        # Store wave points for visualization
-        self.wave_points = (wave[:300] * 32767).astype(np.int16)
+        # Generate waveform, distortion, bit crush and 16-bit volume in one pass
+        _synth_fused(_WAVETABLE_STACK, n, float(freq),
+                     WAVEFORM_IDS.get(waveform, WAVEFORM_IDS['sine']),
+                     effects['distortion'], self.distortion_lut(),
+                     effects['bit_crush'], self.bit_crush_mask(),
+                     np.float32(self.volume), wave_16bit)
         
-        # Convert to 16-bit for Pygame compatibility
-        wave_16bit = (wave * 32767).astype(np.int16)
+        # Low-pass is linear, so filtering after the volume gives the same result
+        if effects['low_pass']:
+            _lowpass(wave_16bit, np.float32(0.1))
         
-        # Create stereo sound
-        stereo_wave = np.column_stack((wave_16bit, wave_16bit))
+        # Store one period in 300 bins for visualization, normalized to [-1, 1]
+        period = SAMPLE_RATE / freq
+        idx = np.minimum((np.arange(300) * (period / 300)).astype(int), n - 1)
+        wave_points = wave_16bit[idx] * np.float32(1 / 32767)
         
-        # Apply delay effect
-        if self.effects['delay']:
+        # Apply delay effect (mix in a half-level copy shifted by the delay)
+        if effects['delay']:
             delay_samples = int(SAMPLE_RATE * self.delay_time)
-            if len(stereo_wave) > delay_samples:
-                delayed = np.roll(stereo_wave, delay_samples, axis=0)
-                delayed[:delay_samples] = 0
-                stereo_wave = stereo_wave + (delayed * 0.5).astype(np.int16)
+            if 0 < delay_samples < n:
+                echo = self._delay_i16[:n - delay_samples]
+                np.right_shift(wave_16bit[:-delay_samples], 1, out=echo)
+                np.add(wave_16bit[delay_samples:], echo, out=wave_16bit[delay_samples:])
+        
+        # Create stereo sound (both channels are identical, so copy once at the end)
+        global _mix_scratch
+        if n > len(_mix_scratch):
+            _mix_scratch = np.empty((n, 2), dtype=np.int16)
+        stereo_wave = _mix_scratch[:n]
+        stereo_wave[:] = wave_16bit[:, np.newaxis]
         
-        return pygame.sndarray.make_sound(stereo_wave)
+        return pygame.sndarray.make_sound(stereo_wave), wave_points
+    
+    def bit_crush_mask(self):
+        """Return the fixed-point mask for steps of 1/2**bit_crush_factor of full scale"""
+        return -(1 << (BIT_DEPTH - 1 - self.bit_crush_factor))
+    
+    def distortion_lut(self):
+        """Return the tanh curve, rebuilt only when the amount changes"""
+        if self._tanh_lut_amount != self.distortion_amount:
+            self._tanh_lut = build_tanh_lut(self.distortion_amount)
+            self._tanh_lut_amount = self.distortion_amount
+        return self._tanh_lut
+    
+    def sound_settings(self):
+        """Return everything besides the note that shapes a generated Sound"""
+        return (tuple(sorted(self.effects.items())), self.volume,
+                self.distortion_amount, self.bit_crush_factor, self.delay_time)
+    
+    def _render_sound(self, freq, waveform, duration, settings):
+        """Generate a note; cached through _build_sound, so settings must be current"""
+        return self.generate_sample(freq, waveform, dict(settings[0]), duration)
+    
+    def prewarm(self, freqs, waveforms, duration=1.0):
+        """Build sounds for every note and waveform with the current settings"""
+        settings = self.sound_settings()
+        for waveform in waveforms:
+            for freq in freqs:
+                self._build_sound(freq, waveform, duration, settings)
     
     def play_note(self, freq, note_name, waveform='sine', duration=1.0):
         """Play note"""
         self.frequency = freq
         self.waveform = waveform
         self.current_note = note_name
-        self.sound = self.generate_sample(duration)
-        self.sound.play()
+        settings = self.sound_settings()
+        key = (freq, waveform, duration, settings)
+        
+        # Same note and settings as last time: just retrigger it
+        if key == self._last_key:
+            self.channel.stop()
+            self.channel.play(self._last_sound)
+            self.playing = True
+            return
+        
+        self.sound, self.wave_points = self._build_sound(*key)
+        self._last_key = key
+        self._last_sound = self.sound
+        self.channel.stop()
+        self.channel.play(self.sound)
         self.playing = True
     
     def stop(self):
         """Stop playback"""
-        if self.sound:
-            self.sound.stop()
+        self.channel.stop()
         self.playing = False
         self.current_note = None
 
@@ -191,6 +303,61 @@ class Recorder:
             print(f"Error loading recording: {e}")
             return None
 
+class ParticleSystem:
+    def __init__(self, capacity=512):
+        self.n = 0
+        self.px = np.zeros(capacity, dtype=np.float32)
+        self.py = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        
+    def __len__(self):
+        return self.n
+        
+    def add(self, x, y, color, count=1):
+        """Add particles (dropped once full)"""
+        i = self.n
+        j = min(i + count, len(self.px))
+        if j <= i:
+            return
+        velocity = rng.uniform((-2, -3), (2, 0), size=(j - i, 2))
+        self.px[i:j] = x
+        self.py[i:j] = y
+        self.vx[i:j] = velocity[:, 0]
+        self.vy[i:j] = velocity[:, 1]
+        self.size[i:j] = rng.integers(2, 6, size=j - i)
+        self.life[i:j] = 1.0
+        self.color[i:j] = color
+        self.n = j
+        
+    def bounds(self):
+        """Return the screen area covered by particles, or None"""
+        n = self.n
+        if n == 0:
+            return None
+        x0 = int(self.px[:n].min()) - 7
+        y0 = int(self.py[:n].min()) - 7
+        x1 = int(self.px[:n].max()) + 7
+        y1 = int(self.py[:n].max()) + 7
+        return pygame.Rect(x0, y0, x1 - x0, y1 - y0)
+        
+    def update(self):
+        """Move and age particles, dropping dead ones"""
+        n = self.n
+        self.px[:n] += self.vx[:n]
+        self.py[:n] += self.vy[:n]
+        self.life[:n] -= 0.02
+        
+        alive = np.flatnonzero(self.life[:n] > 0)
+        m = len(alive)
+        if m < n:
+            for arr in (self.px, self.py, self.vx, self.vy, self.life, self.size, self.color):
+                arr[:m] = arr[alive]
+        self.n = m
+
 # Create synth and recorder
 synth = Synth()
 recorder = Recorder()
@@ -221,6 +388,9 @@ waveforms = [
 ]
 current_waveform = 0
 
+# Build the default sounds up front so the first keypress doesn't wait
+synth.prewarm([key['freq'] for key in keys], [wave['name'] for wave in waveforms])
+
 # Effect pedals
 pedals = [
     {'key': pygame.K_1, 'name': 'DISTORTION', 'effect': 'distortion', 'color': NEON_RED},
@@ -229,27 +399,86 @@ pedals = [
     {'key': pygame.K_4, 'name': 'BIT CRUSH', 'effect': 'bit_crush', 'color': NEON_GREEN}
 ]
 
+# Key lookups for event dispatch
+KEY_MAP = {key['key']: key for key in keys}
+PEDAL_MAP = {pedal['key']: pedal for pedal in pedals}
+
+# Instructions bar
+instructions = [
+    "A S D F G H J K  -  NOTES",
+    "W E T Y U  -  SHARPS", 
+    "SPACE  -  WAVEFORM",
+    "1-4  -  EFFECTS",
+    "R  -  RECORD/STOP",
+    "S  -  SAVE",
+    "ESC  -  EXIT"
+]
+
+# Screen areas of the panels, for dirty-rect updates
+NOTE_RECT = pygame.Rect(100, 80, 400, 120)
+WAVE_RECT = pygame.Rect(100, 220, 400, 120)
+PIANO_RECT = pygame.Rect(80, 445, 500, 190)
+EFFECTS_RECT = pygame.Rect(650, 80, 300, 200)
+WAVEFORM_RECT = pygame.Rect(650, 300, 300, 120)
+RECORDING_RECT = pygame.Rect(650, 440, 300, 120)
+
 # Animation variables
 wave_animation_offset = 0
 note_animation_alpha = 0
-particles = []
-save_message_time = 0
-
-def create_particle(x, y, color):
-    """Create visual particles"""
-    return {
-        'x': x, 'y': y,
-        'color': color,
-        'size': np.random.randint(2, 6),
-        'speed_x': np.random.uniform(-2, 2),
-        'speed_y': np.random.uniform(-3, 0),
-        'life': 1.0
-    }
+particles = ParticleSystem()
+save_message_time = float('-inf')
+rng = np.random.default_rng()
 
-def draw_rounded_rect(surface, color, rect, radius, alpha=255):
-    """Draw rounded rectangle"""
-    x, y, width, height = rect
-    
+# Rendered text cache
+_font_cache = {}
+_text_cache = {}
+_live_text_cache = {}
+
+def _text(s, size, color):
+    """Render text once and reuse the surface"""
+    key = (s, size, color)
+    surf = _text_cache.get(key)
+    if surf is None:
+        font = _font_cache.get(size)
+        if font is None:
+            font = _font_cache[size] = pygame.font.Font(None, size)
+        surf = font.render(s, True, color)
+        _text_cache[key] = surf
+    return surf
+
+def _live_text(slot, s, size, color):
+    """Render changing text, keeping only the latest surface per slot"""
+    key = (s, size, color)
+    cached = _live_text_cache.get(slot)
+    if cached is None or cached[0] != key:
+        font = _font_cache.get(size)
+        if font is None:
+            font = _font_cache[size] = pygame.font.Font(None, size)
+        cached = _live_text_cache[slot] = (key, font.render(s, True, color))
+    return cached[1]
+
+def prerender_text():
+    """Render the static labels ahead of the first frame"""
+    for title, size, color in [("CURRENT NOTE", 28, NEON_YELLOW), ("KEYBOARD", 24, NEON_YELLOW),
+                               ("EFFECTS PEDALS", 28, NEON_PURPLE), ("WAVEFORM", 28, NEON_GREEN),
+                               ("Play notes to see waveform", 24, TEXT_DIM),
+                               ("Press R to start recording", 24, TEXT_DIM)]:
+        _text(title, size, color)
+    for key in keys:
+        _text(key['note'], 20, TEXT_LIGHT)
+        _text(key['note'], 80, NEON_YELLOW)
+    for wave in waveforms:
+        for color in (BACKGROUND, TEXT_LIGHT):
+            _text(wave['name'].upper(), 20, color)
+    for pedal in pedals:
+        for color in (pedal['color'], TEXT_DIM):
+            _text(f"{pedal['name']} [{pedal['key'] - pygame.K_0}]", 22, color)
+    for line in instructions:
+        _text(line, 20, TEXT_DIM)
+
+@lru_cache(maxsize=64)
+def _rounded_surf(width, height, color, radius, alpha):
+    """Build a rounded rectangle surface (cached per geometry and color)"""
     # Create temporary surface for alpha
     temp_surface = pygame.Surface((width, height), pygame.SRCALPHA)
     
@@ -259,12 +488,16 @@ def draw_rounded_rect(surface, color, rect, radius, alpha=255):
     else:
         r, g, b = color
         pygame.draw.rect(temp_surface, (r, g, b, alpha), (0, 0, width, height), border_radius=radius)
-    
-    # Blit to main surface
-    surface.blit(temp_surface, (x, y))
+    return temp_surface
 
-def draw_glowing_circle(surface, color, pos, radius, glow_size=10):
-    """Draw circle with glow effect"""
+def draw_rounded_rect(surface, color, rect, radius, alpha=255):
+    """Draw rounded rectangle"""
+    x, y, width, height = rect
+    surface.blit(_rounded_surf(width, height, tuple(color), radius, alpha), (x, y))
+
+@lru_cache(maxsize=64)
+def _glow_surf(color, radius, glow_size):
+    """Build a glowing circle surface (cached per color and size)"""
     # Create temporary surface for glow
     size = radius * 2 + glow_size * 2
     temp_surface = pygame.Surface((size, size), pygame.SRCALPHA)
@@ -277,7 +510,11 @@ def draw_glowing_circle(surface, color, pos, radius, glow_size=10):
     
     # Draw main circle
     pygame.draw.circle(temp_surface, (*color, 255), center, radius)
-    
+    return temp_surface
+
+def draw_glowing_circle(surface, color, pos, radius, glow_size=10):
+    """Draw circle with glow effect"""
+    temp_surface = _glow_surf(tuple(color), radius, glow_size)
     surface.blit(temp_surface, (pos[0] - radius - glow_size, pos[1] - radius - glow_size))
 
 def draw_wave_visualization(surface, wave_points, x, y, width, height):
@@ -287,8 +524,7 @@ def draw_wave_visualization(surface, wave_points, x, y, width, height):
         draw_rounded_rect(surface, PANEL_LIGHT, (x, y, width, height), 15)
         pygame.draw.rect(surface, NEON_BLUE, (x, y, width, height), 2, border_radius=15)
         
-        font = pygame.font.Font(None, 24)
-        text = font.render("Play notes to see waveform", True, TEXT_DIM)
+        text = _text("Play notes to see waveform", 24, TEXT_DIM)
         surface.blit(text, (x + width//2 - text.get_width()//2, y + height//2 - text.get_height()//2))
         return
         
@@ -302,17 +538,14 @@ def draw_wave_visualization(surface, wave_points, x, y, width, height):
     global wave_animation_offset
     wave_animation_offset = (wave_animation_offset + 2) % len(wave_points)
     
-    points = []
-    for i in range(width):
-        idx = (i + wave_animation_offset) % len(wave_points)
-        value = wave_points[idx]
-        normalized_y = y + height//2 + (value / 32767) * (height//2 - 20)
-        points.append((x + i, normalized_y))
+    i = np.arange(width)
+    idx = (i + wave_animation_offset) % len(wave_points)
+    ys = y + height//2 + wave_points[idx] * (height//2 - 20)
+    points = np.column_stack((x + i, ys)).astype(int).tolist()
     
     if len(points) > 1:
         # Draw main waveform
-        for i in range(len(points) - 1):
-            pygame.draw.line(surface, NEON_BLUE, points[i], points[i+1], 3)
+        pygame.draw.lines(surface, NEON_BLUE, False, points, 3)
 
 def draw_piano(surface, keys, current_note):
     """Draw modern piano keyboard"""
@@ -320,8 +553,7 @@ def draw_piano(surface, keys, current_note):
     draw_rounded_rect(surface, PANEL_DARK, (80, 480, 500, 150), 10)
     
     # Draw keyboard title
-    font = pygame.font.Font(None, 24)
-    title = font.render("KEYBOARD", True, NEON_YELLOW)
+    title = _text("KEYBOARD", 24, NEON_YELLOW)
     surface.blit(title, (80 + 250 - title.get_width()//2, 450))
     
     for key in keys:
@@ -344,12 +576,11 @@ def draw_piano(surface, keys, current_note):
             pygame.draw.rect(surface, glow_color, key_rect, 2, border_radius=5)
             
             # Add particles
-            if np.random.random() < 0.3:
-                particles.append(create_particle(x + 15, y, base_color))
+            if rng.random() < 0.3:
+                particles.add(x + 15, y, base_color)
         
         # Draw note label
-        font = pygame.font.Font(None, 20)
-        text = font.render(key['note'], True, TEXT_LIGHT)
+        text = _text(key['note'], 20, TEXT_LIGHT)
         surface.blit(text, (x + 8, y + 85))
 
 def draw_effects_pedals(surface, pedals, synth):
@@ -358,8 +589,7 @@ def draw_effects_pedals(surface, pedals, synth):
     draw_rounded_rect(surface, PANEL_LIGHT, (650, 80, 300, 200), 15)
     
     # Title
-    title_font = pygame.font.Font(None, 28)
-    title = title_font.render("EFFECTS PEDALS", True, NEON_PURPLE)
+    title = _text("EFFECTS PEDALS", 28, NEON_PURPLE)
     surface.blit(title, (800 - title.get_width()//2, 95))
     
     for i, pedal in enumerate(pedals):
@@ -377,9 +607,8 @@ def draw_effects_pedals(surface, pedals, synth):
             draw_glowing_circle(surface, pedal['color'], (x + 20, y + 18), 4)
         
         # Draw pedal text
-        font = pygame.font.Font(None, 22)
         text_color = pedal['color'] if active else TEXT_DIM
-        text = font.render(f"{pedal['name']} [{pedal['key'] - pygame.K_0}]", True, text_color)
+        text = _text(f"{pedal['name']} [{pedal['key'] - pygame.K_0}]", 22, text_color)
         surface.blit(text, (x + 40, y + 8))
 
 def draw_waveform_selector(surface, waveforms, current):
@@ -388,8 +617,7 @@ def draw_waveform_selector(surface, waveforms, current):
     draw_rounded_rect(surface, PANEL_LIGHT, (650, 300, 300, 120), 15)
     
     # Title
-    title_font = pygame.font.Font(None, 28)
-    title = title_font.render("WAVEFORM", True, NEON_GREEN)
+    title = _text("WAVEFORM", 28, NEON_GREEN)
     surface.blit(title, (800 - title.get_width()//2, 315))
     
     # Draw waveform buttons
@@ -402,54 +630,46 @@ def draw_waveform_selector(surface, waveforms, current):
         draw_rounded_rect(surface, button_color, (x, y, 60, 40), 8)
         
         # Button text
-        font = pygame.font.Font(None, 20)
         text_color = BACKGROUND if is_active else TEXT_LIGHT
-        text = font.render(wave['name'].upper(), True, text_color)
+        text = _text(wave['name'].upper(), 20, text_color)
         surface.blit(text, (x + 30 - text.get_width()//2, y + 20 - text.get_height()//2))
 
-def draw_recording_status(surface, recorder, save_message_time):
+def draw_recording_status(surface, recorder, save_message_time, now_ms):
     """Draw modern recording status"""
     # Draw panel
     draw_rounded_rect(surface, PANEL_LIGHT, (650, 440, 300, 120), 15)
     
     # Show save message if recently saved
-    current_time = time.time()
-    if current_time - save_message_time < 3:
-        font = pygame.font.Font(None, 24)
-        text = font.render("Recording Saved!", True, NEON_GREEN)
+    if now_ms * 1e-3 - save_message_time < 3:
+        text = _text("Recording Saved!", 24, NEON_GREEN)
         surface.blit(text, (800 - text.get_width()//2, 445))
     
     if recorder.recording:
         # Blinking recording indicator
-        if int(time.time() * 2) % 2 == 0:
+        if (now_ms // 500) & 1 == 0:
             draw_glowing_circle(surface, NEON_RED, (670, 490), 6)
         
         # Recording text
-        font = pygame.font.Font(None, 28)
-        text = font.render("RECORDING", True, NEON_RED)
+        text = _text("RECORDING", 28, NEON_RED)
         surface.blit(text, (690, 485))
         
         # Recorded notes count
-        count_font = pygame.font.Font(None, 22)
-        count_text = count_font.render(f"Notes: {len(recorder.recorded_notes)}", True, TEXT_LIGHT)
+        count_text = _live_text('note_count', f"Notes: {len(recorder.recorded_notes)}", 22, TEXT_LIGHT)
         surface.blit(count_text, (690, 515))
         
         # Save hint
-        hint_font = pygame.font.Font(None, 18)
-        hint_text = hint_font.render("Press S to save", True, TEXT_DIM)
+        hint_text = _text("Press S to save", 18, TEXT_DIM)
         surface.blit(hint_text, (690, 535))
     else:
         if recorder.recorded_notes:
-            font = pygame.font.Font(None, 24)
-            text = font.render(f"Ready to record ({len(recorder.recorded_notes)} notes)", True, NEON_GREEN)
+            text = _live_text('ready_count', f"Ready to record ({len(recorder.recorded_notes)} notes)",
+                       24, NEON_GREEN)
             surface.blit(text, (800 - text.get_width()//2, 485))
             
-            hint_font = pygame.font.Font(None, 18)
-            hint_text = hint_font.render("Press R to record, S to save", True, TEXT_DIM)
+            hint_text = _text("Press R to record, S to save", 18, TEXT_DIM)
             surface.blit(hint_text, (800 - hint_text.get_width()//2, 515))
         else:
-            font = pygame.font.Font(None, 24)
-            text = font.render("Press R to start recording", True, TEXT_DIM)
+            text = _text("Press R to start recording", 24, TEXT_DIM)
             surface.blit(text, (800 - text.get_width()//2, 490))
 
 def draw_note_display(surface, current_note):
@@ -465,72 +685,88 @@ def draw_note_display(surface, current_note):
     draw_rounded_rect(surface, PANEL_LIGHT, (100, 80, 400, 120), 20)
     
     # Title
-    font = pygame.font.Font(None, 28)
-    title = font.render("CURRENT NOTE", True, NEON_YELLOW)
+    title = _text("CURRENT NOTE", 28, NEON_YELLOW)
     surface.blit(title, (300 - title.get_width()//2, 95))
     
     if note_animation_alpha > 0 and current_note:
         # Draw note text
-        font = pygame.font.Font(None, 80)
-        text_surface = font.render(current_note, True, NEON_YELLOW)
+        text_surface = _text(current_note, 80, NEON_YELLOW)
         text_surface.set_alpha(note_animation_alpha)
         surface.blit(text_surface, (300 - text_surface.get_width()//2, 140 - text_surface.get_height()//2))
 
 def draw_particles(surface):
     """Draw and update particles"""
-    global particles
+    particles.update()
+    n = particles.n
+    if n == 0:
+        return
     
-    for particle in particles[:]:
-        particle['x'] += particle['speed_x']
-        particle['y'] += particle['speed_y']
-        particle['life'] -= 0.02
-        
-        if particle['life'] <= 0:
-            particles.remove(particle)
-        else:
-            # Calculate particle properties
-            x, y = int(particle['x']), int(particle['y'])
-            size = max(1, int(particle['size'] * particle['life']))
-            alpha = int(255 * particle['life'])
-            
-            # Create color with alpha
-            r, g, b = particle['color']
-            color_with_alpha = (r, g, b, alpha)
-            
-            # Draw particle
-            temp_surface = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-            pygame.draw.circle(temp_surface, color_with_alpha, (size, size), size)
-            surface.blit(temp_surface, (x - size, y - size))
+    # Calculate particle properties
+    life = particles.life[:n]
+    xs = particles.px[:n].astype(int).tolist()
+    ys = particles.py[:n].astype(int).tolist()
+    sizes = np.maximum(1, (particles.size[:n] * life).astype(int)).tolist()
+    alphas = (255 * life).astype(int).tolist()
+    colors = particles.color[:n].tolist()
+    
+    for x, y, size, alpha, (r, g, b) in zip(xs, ys, sizes, alphas, colors):
+        # Draw particle
+        temp_surface = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+        pygame.draw.circle(temp_surface, (r, g, b, alpha), (size, size), size)
+        surface.blit(temp_surface, (x - size, y - size))
+
+def build_background():
+    """Render the background and the static instructions bar"""
+    background = pygame.Surface(screen.get_size())
+    background.fill(BACKGROUND)
+    draw_rounded_rect(background, PANEL_DARK, (50, 650, 900, 40), 8)
+    x_pos = 70
+    for line in instructions:
+        text = _text(line, 20, TEXT_DIM)
+        background.blit(text, (x_pos, 665))
+        x_pos += text.get_width() + 30
+    return background
 
 # Main loop
+prerender_text()
+background = build_background()
+last_panel_states = None
+last_particle_rect = None
 running = True
 while running:
-    screen.fill(BACKGROUND)
+    now_ms = pygame.time.get_ticks()
+    now_s = now_ms * 1e-3
+    screen.blit(background, (0, 0))
     
     # Handle events
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             running = False
             
+        elif event.type == pygame.VIDEOEXPOSE:
+            # Window contents were lost, repaint everything
+            last_panel_states = None
+            
         elif event.type == pygame.KEYDOWN:
             # Piano keys
-            for key_info in keys:
-                if event.key == key_info['key']:
-                    synth.play_note(key_info['freq'], key_info['note'], 
-                                  waveforms[current_waveform]['name'], 1.0)
-                    if recorder.recording:
-                        recorder.add_note(key_info['note'], key_info['freq'], 
-                                        waveforms[current_waveform]['name'])
-                    break
+            key_info = KEY_MAP.get(event.key)
+            if key_info:
+                synth.play_note(key_info['freq'], key_info['note'], 
+                              waveforms[current_waveform]['name'], 1.0)
+                x, y = key_info['pos']
+                particles.add(x + 15, y, key_info['color'], 6)
+                if recorder.recording:
+                    recorder.add_note(key_info['note'], key_info['freq'], 
+                                    waveforms[current_waveform]['name'])
             
             # Waveform change
             if event.key == pygame.K_SPACE:
                 current_waveform = (current_waveform + 1) % len(waveforms)
             
             # Effect pedals
-            for pedal in pedals:
-                if event.key == pedal['key']:
-                    synth.effects[pedal['effect']] = not synth.effects[pedal['effect']]
+            pedal = PEDAL_MAP.get(event.key)
+            if pedal:
+                synth.effects[pedal['effect']] = not synth.effects[pedal['effect']]
             
             # Recording controls
             if event.key == pygame.K_r:
@@ -543,7 +779,7 @@ while running:
             if event.key == pygame.K_s:
                 if recorder.recorded_notes and not recorder.recording:
                     if recorder.save_recording():
-                        save_message_time = time.time()
+                        save_message_time = now_s
             
             # Exit
             elif event.key == pygame.K_ESCAPE:
@@ -555,29 +791,38 @@ while running:
     draw_piano(screen, keys, synth.current_note)
     draw_effects_pedals(screen, pedals, synth)
     draw_waveform_selector(screen, waveforms, current_waveform)
-    draw_recording_status(screen, recorder, save_message_time)
+    draw_recording_status(screen, recorder, save_message_time, now_ms)
     draw_particles(screen)
     
-    # Draw instructions panel
-    draw_rounded_rect(screen, PANEL_DARK, (50, 650, 900, 40), 8)
-    instructions = [
-        "A S D F G H J K  -  NOTES",
-        "W E T Y U  -  SHARPS", 
-        "SPACE  -  WAVEFORM",
-        "1-4  -  EFFECTS",
-        "R  -  RECORD/STOP",
-        "S  -  SAVE",
-        "ESC  -  EXIT"
+    # Only push the panels whose contents changed since the last frame
+    panel_states = [
+        (NOTE_RECT, (synth.current_note, note_animation_alpha)),
+        (PIANO_RECT, synth.current_note),
+        (EFFECTS_RECT, tuple(synth.effects.values())),
+        (WAVEFORM_RECT, current_waveform),
+        (RECORDING_RECT, (recorder.recording, len(recorder.recorded_notes),
+                          recorder.recording and (now_ms // 500) & 1,
+                          now_s - save_message_time < 3))
     ]
-    
-    font = pygame.font.Font(None, 20)
-    x_pos = 70
-    for i, line in enumerate(instructions):
-        text = font.render(line, True, TEXT_DIM)
-        screen.blit(text, (x_pos, 665))
-        x_pos += text.get_width() + 30
-    
-    pygame.display.flip()
+    if last_panel_states is None:
+        dirty = [screen.get_rect()]
+    else:
+        dirty = [rect for (rect, state), (_, last_state) in zip(panel_states, last_panel_states)
+                 if state != last_state]
+    last_panel_states = panel_states
+    
+    # The waveform scrolls every frame once there is one
+    if len(synth.wave_points) > 0:
+        dirty.append(WAVE_RECT)
+    
+    # Cover both where particles are now and where they were erased from
+    particle_rect = particles.bounds()
+    for rect in (particle_rect, last_particle_rect):
+        if rect:
+            dirty.append(rect)
+    last_particle_rect = particle_rect
+    
+    pygame.display.update(dirty)
     clock.tick(60)
 
 pygame.quit()
\ No newline at end of file